@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
+import numpy as np
 import pandas as pd
 import re
 import sys
 
+# First NODE contig name on each line, with its length and coverage
+NODE_PAT = re.compile(r'(?m)^[^\n]*?(NODE_\d+_length_(\d+)_cov_([\d.]+))')
+
+# Approximate number of alignment TSV characters parsed per chunk
+CHUNK_CHARS = 4 * 1024 * 1024
+
 if len(sys.argv) != 4:
     print("Usage: calc_unaligned_stats.py <sample_id> <unaligned_file> <alignment_tsv>", file=sys.stderr)
     sys.exit(1)
@@ -11,30 +18,33 @@ sample_id, unaligned_file, alignment_tsv = sys.argv[1], sys.argv[2], sys.argv[3]
 
 # --- Read unaligned contigs ---
 with open(unaligned_file) as f:
-    unaligned_contigs = {line.strip() for line in f if line.strip()}
+    unaligned_contigs = {line.strip() for line in f.read().splitlines()} - {''}
 
-# --- Parse all_alignments TSV ---
-data = []
+# --- Parse all_alignments TSV in bounded chunks, accumulating sums ---
+total_bases = 0.0
+unaligned_bases = 0.0
+n_parsed = 0
 with open(alignment_tsv) as f:
-    for line in f:
-        m = re.search(r'(NODE_\d+_length_\d+_cov_[\d.]+)', line)
-        if m:
-            contig = m.group(1)
-            mm = re.search(r'length_(\d+)_cov_([\d.]+)', contig)
-            if mm:
-                length = float(mm.group(1))
-                cov = float(mm.group(2))
-                total = length * cov
-                data.append((contig, length, cov, total))
-
-if not data:
+    while True:
+        lines = f.readlines(CHUNK_CHARS)
+        if not lines:
+            break
+        rows = NODE_PAT.findall(''.join(lines))
+        if not rows:
+            continue
+
+        contigs, lengths, covs = zip(*rows)
+        bases = np.array(lengths, dtype=np.int64) * np.array(covs, dtype=np.float64)
+        mask = np.fromiter((c in unaligned_contigs for c in contigs), dtype=bool, count=len(contigs))
+
+        total_bases += bases.sum()
+        unaligned_bases += bases[mask].sum()
+        n_parsed += len(bases)
+
+if not n_parsed:
     print(f"No contigs parsed for {sample_id}")
     sys.exit(0)
 
-df = pd.DataFrame(data, columns=['contig', 'length', 'cov', 'bases'])
-
-total_bases = df['bases'].sum()
-unaligned_bases = df[df['contig'].isin(unaligned_contigs)]['bases'].sum()
 pct = unaligned_bases / total_bases * 100 if total_bases > 0 else 0
 
 # --- Write CSV ---